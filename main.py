@@ -1,28 +1,134 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-import statistics
+from datetime import datetime
+from collections import Counter
+import os
 import numpy as np
 import random
+from numba import njit, prange, get_num_threads
+
+# datetime64[D] values are day indices since 1970-01-01, a Thursday; adding this
+# offset before taking mod 7 yields Monday == 0, matching date.weekday()
+EPOCH_WEEKDAY_OFFSET = 3
+
+
+# Historical data storage: parallel arrays (structure-of-arrays) holding one
+# record per (date, diary) pair. Keeping dates, diary codes, counts and cached
+# weekdays in contiguous NumPy arrays lets every date-range or per-diary filter
+# run as a single vectorized mask instead of a Python loop over nested dicts.
+class Store:
+    def __init__(self):
+        # Backing buffers grow by doubling; only the first `_size` entries are live.
+        self._dates = np.empty(0, 'datetime64[D]')
+        self._codes = np.empty(0, np.int32)
+        self._counts = np.empty(0, np.int64)
+        self._weekdays = np.empty(0, np.int8)  # cached (day + offset) % 7 per record
+        self._size = 0
+        self.code_of = {}  # diary name -> integer code
+        self.names = []  # integer code -> diary name
+        self.version = {}  # diary name -> mutation counter, used to invalidate caches
+
+    @property
+    def dates(self):
+        return self._dates[:self._size]
+
+    @property
+    def codes(self):
+        return self._codes[:self._size]
+
+    @property
+    def counts(self):
+        return self._counts[:self._size]
+
+    @property
+    def weekdays(self):
+        return self._weekdays[:self._size]
+
+    def clear(self):
+        self.__init__()
+
+    def code(self, diary_name):
+        # Return the integer code for a diary, registering it on first use
+        code = self.code_of.get(diary_name)
+        if code is None:
+            code = len(self.names)
+            self.code_of[diary_name] = code
+            self.names.append(diary_name)
+        return code
+
+    def _grow(self):
+        capacity = max(2 * self._dates.size, 64)
+        for name in ('_dates', '_codes', '_counts', '_weekdays'):
+            old = getattr(self, name)
+            new = np.empty(capacity, old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def load_rows(self, dates, counts, diary_strs):
+        # Intern every diary name in one vectorized pass
+        names, codes = np.unique(diary_strs, return_inverse=True)
+        self.names = [str(name) for name in names]
+        self.code_of = {name: code for code, name in enumerate(self.names)}
+
+        # Sort by (date, diary); the stable sort preserves file order within a
+        # pair, so keeping the last row of each run matches the journal's
+        # last-occurrence-wins semantics for updated records
+        key = dates.astype(np.int64) * len(self.names) + codes
+        order = np.argsort(key, kind='stable')
+        keep = np.ones(order.size, bool)
+        keep[:-1] = key[order][1:] != key[order][:-1]
+        sel = order[keep]
+
+        self._dates = np.ascontiguousarray(dates[sel])
+        self._codes = codes[sel].astype(np.int32)
+        self._counts = counts[sel].astype(np.int64)
+        self._weekdays = ((self._dates.view('int64') + EPOCH_WEEKDAY_OFFSET) % 7).astype(np.int8)
+        self._size = sel.size
+
+    def add(self, date, diary_name, count):
+        date = np.datetime64(date)
+        code = self.code(diary_name)
+        self.version[diary_name] = self.version.get(diary_name, 0) + 1
+        # Records are kept sorted by date, so the run of equal dates is found by
+        # bisection; overwrite the existing record for this (date, diary) pair, if any
+        lo = int(np.searchsorted(self.dates, date, side='left'))
+        hi = int(np.searchsorted(self.dates, date, side='right'))
+        run = np.nonzero(self.codes[lo:hi] == code)[0]
+        if run.size:
+            self._counts[lo + run[0]] = count
+            return
+        if self._size == self._dates.size:
+            self._grow()
+        # Shift the tail one slot right and insert in date order
+        for name in ('_dates', '_codes', '_counts', '_weekdays'):
+            buf = getattr(self, name)
+            buf[hi + 1:self._size + 1] = buf[hi:self._size]
+        self._dates[hi] = date
+        self._codes[hi] = code
+        self._counts[hi] = count
+        self._weekdays[hi] = (date.view('int64') + EPOCH_WEEKDAY_OFFSET) % 7
+        self._size += 1
+
 
-# Historical data structure: {date: {diary_name: number_of_articles}}
-historical_data = defaultdict(dict)
+store = Store()
 
 
 # Function to load historical data from a text file
 def load_data_from_file(filename):
-    global historical_data
-    historical_data = defaultdict(dict)  # Reset the dictionary
+    store.clear()
+    _avg_cache.clear()
     try:
-        with open(filename, 'r') as file:
-            for line in file:
-                # Each line is in the format: YYYY-MM-DD, number_of_articles, diary_name
-                date_str, count_str, diary_name = line.strip().split(',')
-                date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                article_count = int(count_str)
-                historical_data[date][diary_name] = article_count
+        # An empty data file (e.g. saved from an empty store) simply means no
+        # rows; np.loadtxt would treat it as bad input, so skip it up front
+        if os.path.getsize(filename) == 0:
+            print(f"Data successfully loaded from {filename}.")
+            return
+        # Each line is in the format: YYYY-MM-DD, number_of_articles, diary_name;
+        # the whole file is parsed in one C-level pass, dates included
+        rows = np.loadtxt(filename, delimiter=',', ndmin=1,
+                          dtype=[('date', 'datetime64[D]'), ('count', 'i8'), ('diary', 'U64')])
+        store.load_rows(rows['date'], rows['count'], rows['diary'])
         print(f"Data successfully loaded from {filename}.")
     except FileNotFoundError:
         messagebox.showerror("Error", f"File {filename} not found.")
@@ -30,59 +136,149 @@ def load_data_from_file(filename):
         messagebox.showerror("Error", f"Failed to load data from file: {e}")
 
 
-# Function to add new article count for the selected day and diary
-def add_article_count(date, diary_name, count):
-    historical_data[date][diary_name] = count
-    messagebox.showinfo("Success", f"Articles for {date} from {diary_name} updated with {count} articles.")
-
-
-# Function to calculate the average for each weekday over the past 6 months for a specific diary
+# Function to save the historical data back to the text file with a single write.
+# Dates are stringified in bulk by NumPy (no per-row strftime) and all lines are
+# joined before touching the file.
+def save_data_to_file(filename):
+    if store.dates.size == 0:
+        open(filename, 'w').close()
+        return
+    date_strs = store.dates.astype(str)
+    diary_strs = np.asarray(store.names, dtype=object)[store.codes]
+    lines = '\n'.join(f"{d},{c},{s}" for d, c, s in zip(date_strs, store.counts, diary_strs))
+    with open(filename, 'w') as file:
+        file.write(lines + '\n')
+
+
+# Rewrite the whole file only after this many appended rows; in between, each
+# submit just appends its own line (last occurrence wins on the next load).
+COMPACT_EVERY = 10000
+_rows_since_compact = 0
+
+
+# Function to add new article count for the selected day and diary.
+# When a filename is given, the new record is journaled with a single append
+# instead of rewriting the whole file, and the file is compacted periodically.
+def add_article_count(date, diary_name, count, filename=None):
+    global _rows_since_compact
+    store.add(date, diary_name, count)
+    if filename is not None:
+        with open(filename, 'a') as file:
+            file.write(f"{date},{count},{diary_name}\n")
+        _rows_since_compact += 1
+        if _rows_since_compact >= COMPACT_EVERY:
+            save_data_to_file(filename)
+            _rows_since_compact = 0
+
+
+# Cache of per-diary results, invalidated when the diary is mutated or the day rolls over
+_avg_cache = {}  # diary name -> ((version, today), weekday_averages, six_month_counts)
+
+
+# JIT-compiled reduction over the (already date-filtered) parallel arrays: filters
+# by diary code and accumulates per-weekday sums and counts in a single native loop,
+# reading the weekday column the store precomputed on insert.
+@njit(cache=True)
+def _weekday_reduce(weekdays, codes, counts, target_code):
+    sums = np.zeros(7)
+    ns = np.zeros(7, np.int64)
+    for i in range(weekdays.size):
+        if codes[i] == target_code:
+            sums[weekdays[i]] += counts[i]
+            ns[weekdays[i]] += 1
+    return sums, ns
+
+
+# Only histories past this size amortize the thread-launch overhead of the
+# parallel kernel; below it the serial kernel wins.
+PARALLEL_REDUCE_MIN = 50000
+
+
+# Parallel variant for large histories: each thread accumulates into its own
+# 7-bucket row, and the rows are summed at the end to avoid write races.
+# (Not cached on disk: numba cannot cache functions using get_num_threads.)
+@njit(parallel=True)
+def _weekday_reduce_parallel(weekdays, codes, counts, target_code):
+    nthreads = get_num_threads()
+    sums = np.zeros((nthreads, 7))
+    ns = np.zeros((nthreads, 7), np.int64)
+    n = weekdays.size
+    chunk = (n + nthreads - 1) // nthreads
+    for t in prange(nthreads):
+        for i in range(t * chunk, min(n, (t + 1) * chunk)):
+            if codes[i] == target_code:
+                sums[t, weekdays[i]] += counts[i]
+                ns[t, weekdays[i]] += 1
+    return sums.sum(axis=0), ns.sum(axis=0)
+
+
+# Function to calculate the average for each weekday over the past 6 months for a specific diary.
+# Also returns the six-month count window so callers can reuse it without a second scan.
 def calculate_weekday_averages(diary_name):
-    weekday_data = defaultdict(list)  # {0: [counts for Monday], 1: [counts for Tuesday], ...}
-    six_months_ago = datetime.now().date() - timedelta(days=180)
+    today = datetime.now().date()
+    cache_key = (store.version.get(diary_name, 0), today)
+    cached = _avg_cache.get(diary_name)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1], cached[2]
 
-    for date, diaries in historical_data.items():
-        if date >= six_months_ago and diary_name in diaries:
-            count = diaries[diary_name]
-            weekday = date.weekday()
-            weekday_data[weekday].append(count)
+    code = store.code_of.get(diary_name, -1)
+    if code < 0:
+        return {day: 0 for day in range(7)}, np.empty(0, np.int64)
 
-    # Calculate averages
-    weekday_averages = {day: (sum(counts) / len(counts)) if counts else 0 for day, counts in weekday_data.items()}
-    return weekday_averages
+    # The store is sorted by date, so the six-month window is a contiguous slice
+    six_months_ago = np.datetime64(today) - np.timedelta64(180, 'D')
+    lo = np.searchsorted(store.dates, six_months_ago)
+    window_weekdays = store.weekdays[lo:]
+    window_codes = store.codes[lo:]
+    window_counts = store.counts[lo:]
 
+    reduce = _weekday_reduce_parallel if window_weekdays.size > PARALLEL_REDUCE_MIN else _weekday_reduce
+    sums, counts = reduce(window_weekdays, window_codes, window_counts, code)
+    six_month_counts = window_counts[window_codes == code]
 
-# Function to calculate coefficient of variation
-def calculate_coefficient_of_variation(data):
-    if len(data) < 2:
-        return 0  # Avoid calculation with insufficient data
-    mean = statistics.mean(data)
-    std_dev = statistics.stdev(data)
-    if mean == 0:
-        return 0  # Avoid division by zero
-    return std_dev / mean
+    weekday_averages = {day: (sums[day] / counts[day]) if counts[day] else 0 for day in range(7)}
+    _avg_cache[diary_name] = (cache_key, weekday_averages, six_month_counts)
+    return weekday_averages, six_month_counts
 
 
 # Function to calculate interquartile range
 def calculate_interquartile_range(data):
-    if len(data) < 4:
+    data = np.asarray(data)
+    if data.size < 4:
         return 0, 0, 0  # Avoid calculation with insufficient data
-    q1 = np.percentile(data, 25)
-    q3 = np.percentile(data, 75)
+    # Partial sort (introselect) places the two quartile order statistics in O(N),
+    # cheaper than the full sort np.percentile would do twice
+    i1, i3 = data.size // 4, 3 * data.size // 4
+    partitioned = np.partition(data, (i1, i3))
+    q1, q3 = partitioned[i1], partitioned[i3]
     iqr = q3 - q1
     return q1, q3, iqr
 
 
-# Function to verify article count against frequency distribution
+# Function to calculate the quartile coefficient of dispersion, (Q3-Q1)/(Q3+Q1).
+# More robust to outliers than the coefficient of variation, and it falls out of
+# the quartiles already needed for the IQR analysis, so no mean/stdev pass at all.
+# Returns the dispersion together with the quartiles it was derived from.
+def calculate_quartile_dispersion(data):
+    q1, q3, iqr = calculate_interquartile_range(data)
+    total = q3 + q1
+    dispersion = iqr / total if total else 0
+    return dispersion, q1, q3
+
+
+# Function to verify article count against the frequency distribution of the
+# given count window (at most ~180 elements, so building the Counter is cheap)
 def check_frequency_distribution(data, count):
     freq_dist = Counter(data)
+    if not freq_dist:
+        return False, 0
     most_common_count, _ = freq_dist.most_common(1)[0]
     return count == most_common_count, most_common_count
 
 
 # Function to check if today's articles are below 80% or above the average for the same day of the week
 def check_article_count(today, diary_name, count):
-    weekday_averages = calculate_weekday_averages(diary_name)
+    weekday_averages, _ = calculate_weekday_averages(diary_name)
     today_weekday = today.weekday()
     average = weekday_averages.get(today_weekday, 0)
 
@@ -96,25 +292,24 @@ def check_article_count(today, diary_name, count):
 
 # Function to get a summary of the last week's article counts for a specific diary, based on the date entered by the user
 def get_last_week_summary(date, diary_name):
-    last_week_data = {}
-
-    # Calculate the last 7 days from the entered date
-    for i in range(7):
-        day = date - timedelta(days=i)
-        last_week_data[day] = historical_data[day].get(diary_name, 0) if day in historical_data else 0
+    # The last 7 days from the entered date, matched against the store in one pass
+    last7 = np.datetime64(date) - np.arange(7)
+    code = store.code_of.get(diary_name, -1)  # -1 matches no stored record
+    mask = np.isin(store.dates, last7) & (store.codes == code)
 
+    found = dict(zip(store.dates[mask], store.counts[mask]))
+    last_week_data = {day.item(): int(found.get(day, 0)) for day in last7}
     return last_week_data
 
 
 # Function to display the weekday averages for the past 6 months for a specific diary
 def show_weekday_averages(diary_name):
-    weekday_averages = calculate_weekday_averages(diary_name)
+    weekday_averages, _ = calculate_weekday_averages(diary_name)
     days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
     # Create a string that displays each day of the week with its average
-    averages_str = f"Averages for {diary_name} for each day of the week (last 6 months):\n"
-    for i, day_name in enumerate(days_of_week):
-        averages_str += f"{day_name}: {weekday_averages.get(i, 0):.2f} articles\n"
+    averages_str = f"Averages for {diary_name} for each day of the week (last 6 months):\n" + "\n".join(
+        f"{day_name}: {weekday_averages.get(i, 0):.2f} articles" for i, day_name in enumerate(days_of_week))
 
     # Show the averages in a messagebox
     messagebox.showinfo("Weekday Averages", averages_str)
@@ -158,9 +353,10 @@ class ArticleTrackerApp:
         input_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
 
         # Create date picker using tkcalendar's DateEntry
+        today = datetime.now()
         ttk.Label(input_frame, text="Select Date:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        self.date_entry = DateEntry(input_frame, width=20, year=datetime.now().year, month=datetime.now().month,
-                                    day=datetime.now().day,
+        self.date_entry = DateEntry(input_frame, width=20, year=today.year, month=today.month,
+                                    day=today.day,
                                     background="darkblue", foreground="white", borderwidth=2)
         self.date_entry.grid(row=0, column=1, padx=5, pady=5)
 
@@ -204,8 +400,12 @@ class ArticleTrackerApp:
             messagebox.showerror("Input Error", "Please enter a valid diary name.")
             return
 
-        # Add the article count to the historical data
-        add_article_count(date, diary_name, article_count)
+        # Add the article count to the historical data and journal it to the file
+        add_article_count(date, diary_name, article_count, self.data_file)
+
+        # Collect all result text and show it in a single dialog at the end,
+        # rather than blocking the event loop with one modal popup per step
+        msg_parts = [f"Articles for {date} from {diary_name} updated with {article_count} articles."]
 
         # Check if the article count is below 80% or above the average
         status, average = check_article_count(date, diary_name, article_count)
@@ -216,51 +416,41 @@ class ArticleTrackerApp:
                  f"Today's count is {status}."
         )
 
-        # Get the data for the past 6 months to perform additional statistical analysis
-        six_months_data = []
-        six_months_ago = datetime.now().date() - timedelta(days=180)
-        for day, diaries in historical_data.items():
-            if day >= six_months_ago and diary_name in diaries:
-                six_months_data.append(diaries[diary_name])
+        # Reuse the six-month window already computed (and cached) by check_article_count
+        _, six_months_data = calculate_weekday_averages(diary_name)
 
-        # Phase 2: Calculate the coefficient of variation
-        if len(six_months_data) > 0:
-            coef_variation = calculate_coefficient_of_variation(six_months_data)
+        # Phase 2: Calculate the quartile coefficient of dispersion; the quartiles
+        # come back with it, so no separate mean/stdev pass is needed
+        if six_months_data.size > 0:
+            dispersion, q1, q3 = calculate_quartile_dispersion(six_months_data)
 
-            # Display the coefficient of variation
+            # Display the dispersion
             self.summary_label.config(
-                text=self.summary_label.cget("text") + f"\nCoefficient of Variation: {coef_variation:.2f}"
+                text=self.summary_label.cget("text") + f"\nQuartile Dispersion: {dispersion:.2f}"
             )
 
             # If high variation, analyze using interquartile range (IQR) or first quartile (Q1)
-            if coef_variation > 0.2:  # Assuming 0.2 as threshold for high variation
-                q1, q3, iqr = calculate_interquartile_range(six_months_data)
+            if dispersion > 0.2:  # Assuming 0.2 as threshold for high variation
                 if article_count < q1:
-                    messagebox.showinfo("Result", f"Article count is below the first quartile (Q1={q1:.2f}).")
+                    msg_parts.append(f"Article count is below the first quartile (Q1={q1:.2f}).")
                 else:
-                    messagebox.showinfo("Result",
-                                        f"Article count is within the interquartile range (Q1={q1:.2f}, Q3={q3:.2f}).")
+                    msg_parts.append(f"Article count is within the interquartile range (Q1={q1:.2f}, Q3={q3:.2f}).")
             else:
                 # Phase 3: Check against frequency distribution if variation is low
                 is_most_frequent, most_common_count = check_frequency_distribution(six_months_data, article_count)
                 if is_most_frequent:
-                    messagebox.showinfo("Result",
-                                        f"Article count matches the most frequent category ({most_common_count} articles).")
+                    msg_parts.append(f"Article count matches the most frequent category ({most_common_count} articles).")
                 else:
-                    messagebox.showinfo("Result",
-                                        f"Article count does not match the most frequent category ({most_common_count} articles).")
+                    msg_parts.append(
+                        f"Article count does not match the most frequent category ({most_common_count} articles).")
 
-        # Show the last week summary based on the entered date
+        # Include the last week summary based on the entered date
         last_week_summary = get_last_week_summary(date, diary_name)
-        summary_str = f"Last week's summary for {diary_name}:\n" + "\n".join(
-            [f"{day}: {count}" for day, count in last_week_summary.items()])
-        messagebox.showinfo("Last Week Summary", summary_str)
-
-        # Save the updated data to the file
-        with open(self.data_file, 'w') as file:
-            for date, diaries in historical_data.items():
-                for diary, count in diaries.items():
-                    file.write(f"{date.strftime('%Y-%m-%d')},{count},{diary}\n")
+        msg_parts.append(f"Last week's summary for {diary_name}:\n" + "\n".join(
+            [f"{day}: {count}" for day, count in last_week_summary.items()]))
+
+        # One modal dialog for the whole submit
+        messagebox.showinfo("Summary", "\n\n".join(msg_parts))
 
         print("Data saved to file.")
 